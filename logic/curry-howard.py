@@ -5,6 +5,7 @@ https://wikipedia.org/wiki/Curry%E2%80%93Howard_correspondence
 """
 
 
+from collections import ChainMap
 from dataclasses import dataclass
 
 # We start by implementing a simple typed programming language.
@@ -15,12 +16,12 @@ from dataclasses import dataclass
 # Types are Propositions.
 
 
-@dataclass
+@dataclass(frozen=True)
 class IntType:
     def __repr__(self): return "Int"
 
 
-@dataclass
+@dataclass(frozen=True)
 class BoolType:
     def __repr__(self): return "Bool"
 
@@ -28,19 +29,19 @@ class BoolType:
 # For generalization and convenience, we can use our own dataclass 'Type'.
 
 
-@dataclass
+@dataclass(frozen=True)
 class Type:
     pass
 
 
-@dataclass
+@dataclass(frozen=True)
 class Atom(Type):
     """A basic proposition like 'A' or 'B'"""
     name: str
     def __repr__(self): return self.name
 
 
-@dataclass
+@dataclass(frozen=True)
 class Arrow(Type):
     """
     Represents Implication (A -> B).
@@ -135,102 +136,143 @@ class TypeCheckError(Exception):
     pass
 
 
-# Variables = Hypotheses
-# Context will be a lookup table for the
-#   types/values of our assumptions/variables.
-# Nodes are Proofs as described above.
-def check(ctx, node):
+# Types are immutable, so structurally equal ones can share a single
+# canonical instance: comparing two interned types is then a pointer
+# comparison instead of a recursive walk.
+_TYPE_CACHE = {}
+
+
+def intern_type(t):
     """
-    Asserts that the node is valid under our type system,
-    throws a TypeCheckError if it's not.
+    Returns the canonical instance structurally equal to `t`.
     """
+    if isinstance(t, Arrow):
+        t = Arrow(intern_type(t.left), intern_type(t.right))
+    return _TYPE_CACHE.setdefault(t, t)
+
 
+_INT = intern_type(IntType())
+_BOOL = intern_type(BoolType())
 
-    # Base Cases: Literals
 
-    if isinstance(node, Num):
-        return IntType()
+# Base Cases: Literals
 
-    if isinstance(node, Bool):
-        return BoolType()
+def _check_num(ctx, node):
+    return _INT
 
 
-    # Variables
+def _check_bool(ctx, node):
+    return _BOOL
 
-    if isinstance(node, Var):
-        if node.name not in ctx:
-            raise TypeCheckError(f"Use of unproven assumption: {node.name}")
-        return ctx[node.name]
 
+# Variables
 
-    # Addition
+def _check_var(ctx, node):
+    if node.name not in ctx:
+        raise TypeCheckError(f"Use of unproven assumption: {node.name}")
+    # Contexts supplied by the caller may hold structurally equal but
+    # distinct instances; interning here keeps the identity
+    # comparisons above sound.
+    return intern_type(ctx[node.name])
 
-    if isinstance(node, Add):
-        left_type = check(ctx, node.left)
-        right_type = check(ctx, node.right)
 
-        # Rule: Both sides must be Int
-        if (not isinstance(left_type, IntType)
-                or not isinstance(right_type, IntType)):
-            raise TypeCheckError(
-                f"Add expects Ints, got {left_type} and {right_type}")
+# Addition
 
-        return IntType()
+def _check_add(ctx, node):
+    left_type = check(ctx, node.left)
+    right_type = check(ctx, node.right)
 
+    # Rule: Both sides must be Int
+    if left_type is not _INT or right_type is not _INT:
+        raise TypeCheckError(
+            f"Add expects Ints, got {left_type} and {right_type}")
 
-    # If-Statement
+    return _INT
 
-    if isinstance(node, If):
-        cond_type = check(ctx, node.condition)
-        then_type = check(ctx, node.then_branch)
-        else_type = check(ctx, node.else_branch)
 
-        # Rule: Condition must be Bool
-        if not isinstance(cond_type, BoolType):
-            raise TypeCheckError(f"If condition must be Bool, got {cond_type}")
+# If-Statement
 
-        # Rule: Branches must match
-        if then_type != else_type:
-            raise TypeCheckError(
-                f"Branches mismatch: then={then_type}, else={else_type}")
+def _check_if(ctx, node):
+    cond_type = check(ctx, node.condition)
+    then_type = check(ctx, node.then_branch)
+    else_type = check(ctx, node.else_branch)
 
-        return then_type
+    # Rule: Condition must be Bool
+    if cond_type is not _BOOL:
+        raise TypeCheckError(f"If condition must be Bool, got {cond_type}")
 
+    # Rule: Branches must match
+    if then_type is not else_type:
+        raise TypeCheckError(
+            f"Branches mismatch: then={then_type}, else={else_type}")
 
-    # Function Definition: Implication.
+    return then_type
 
-    if isinstance(node, Lam):
-        # Evaluate the Lambda's body inside a new context
-        # where the assumption is true.
-        # In other words, evaluate the Lambda's body in a new context
-        # where the given variable is of the given type.
-        body_type = check({**ctx, node.var_name: node.var_type},
-                          node.body)
-        # The check above will fail when body will not be valid given the arg.
-        return Arrow(node.var_type, body_type)
 
+# Function Definition: Implication.
 
-    # Function Application: If (A->B) and A, B.
+def _check_lam(ctx, node):
+    # Evaluate the Lambda's body inside a new context
+    # where the assumption is true.
+    # In other words, evaluate the Lambda's body in a new context
+    # where the given variable is of the given type.
+    # Chaining the new binding onto the old context is O(1); copying
+    # the dict would be O(|ctx|) per lambda, quadratic when nested.
+    var_type = intern_type(node.var_type)
+    body_type = check(ChainMap({node.var_name: var_type}, ctx),
+                      node.body)
+    # The check above will fail when body will not be valid given the arg.
+    return intern_type(Arrow(var_type, body_type))
 
-    if isinstance(node, App):
-        func_type = check(ctx, node.func)
-        arg_type = check(ctx, node.arg)
 
-        if not isinstance(func_type, Arrow):
-            # Attempting to call something that's not a function.
-            raise TypeCheckError(
-                f"Attempting to apply logic to non-implication: {func_type}")
+# Function Application: If (A->B) and A, B.
 
-        # The Moment of Truth: Does the argument match the requirement?
-        if func_type.left != arg_type:
-            raise TypeCheckError(
-                f"""Logic Mismatch: Needed proof of {func_type.left},
-                got {arg_type}""")
+def _check_app(ctx, node):
+    func_type = check(ctx, node.func)
+    arg_type = check(ctx, node.arg)
 
-        # You're Right!
-        return func_type.right
+    if not isinstance(func_type, Arrow):
+        # Attempting to call something that's not a function.
+        raise TypeCheckError(
+            f"Attempting to apply logic to non-implication: {func_type}")
 
-    raise TypeCheckError(f"Unknown node: {node}")
+    # The Moment of Truth: Does the argument match the requirement?
+    # Both types are interned, so identity is structural equality.
+    if func_type.left is not arg_type:
+        raise TypeCheckError(
+            f"""Logic Mismatch: Needed proof of {func_type.left},
+            got {arg_type}""")
+
+    # You're Right!
+    return func_type.right
+
+
+# Node type -> handler, so check dispatches in one dict lookup
+# instead of an isinstance cascade.
+HANDLERS = {
+    Num: _check_num,
+    Bool: _check_bool,
+    Var: _check_var,
+    Add: _check_add,
+    If: _check_if,
+    Lam: _check_lam,
+    App: _check_app,
+}
+
+
+# Variables = Hypotheses
+# Context will be a lookup table for the
+#   types/values of our assumptions/variables.
+# Nodes are Proofs as described above.
+def check(ctx, node):
+    """
+    Asserts that the node is valid under our type system,
+    throws a TypeCheckError if it's not.
+    """
+    handler = HANDLERS.get(type(node))
+    if handler is None:
+        raise TypeCheckError(f"Unknown node: {node}")
+    return handler(ctx, node)
 
 
 if __name__ == '__main__':
@@ -41,6 +41,18 @@ class Sentence():
 
 class Symbol(Sentence):
 
+    # Symbols are interned: the same name always yields the same
+    # object, so sentences over few symbols share instances instead of
+    # allocating one per mention.
+    _cache = {}
+
+    def __new__(cls, name):
+        symbol = cls._cache.get(name)
+        if symbol is None:
+            symbol = super().__new__(cls)
+            cls._cache[name] = symbol
+        return symbol
+
     def __init__(self, name):
         self.name = name
 
@@ -94,7 +106,13 @@ class And(Sentence):
     def __init__(self, *conjuncts):
         for conjunct in conjuncts:
             Sentence.validate(conjunct)
-        self.conjuncts = list(conjuncts)
+        # Flatten nested Ands so evaluating a conjunction walks one
+        # flat list instead of recursing per nesting level.
+        self.conjuncts = [
+            c for conjunct in conjuncts
+            for c in (conjunct.conjuncts if isinstance(conjunct, And)
+                      else (conjunct,))
+        ]
 
     def __eq__(self, other):
         return isinstance(other, And) and self.conjuncts == other.conjuncts
@@ -112,7 +130,10 @@ class And(Sentence):
 
     def add(self, conjunct):
         Sentence.validate(conjunct)
-        self.conjuncts.append(conjunct)
+        if isinstance(conjunct, And):
+            self.conjuncts.extend(conjunct.conjuncts)
+        else:
+            self.conjuncts.append(conjunct)
 
     def evaluate(self, model):
         return all(conjunct.evaluate(model) for conjunct in self.conjuncts)
@@ -258,3 +279,105 @@ def model_check(knowledge, query):
 
     # Check that knowledge entails query
     return check_all(knowledge, query, symbols, dict())
+
+
+def to_cnf(sentence):
+    """
+    Convert a sentence to an equisatisfiable CNF clause list via
+    Tseitin encoding: every subformula gets an integer variable and a
+    handful of clauses tying it to its parts, keeping the result
+    linear in the size of the sentence.
+
+    Returns (clauses, symbol_ids) where each clause is a list of
+    nonzero ints (negative means negated) and symbol_ids maps each
+    symbol name to its positive variable id.
+    """
+    clauses = []
+    symbol_ids = {}
+    counter = [0]
+
+    def new_var():
+        counter[0] += 1
+        return counter[0]
+
+    def literal(s):
+        """Returns the integer literal equivalent to subformula `s`."""
+        if isinstance(s, Symbol):
+            if s.name not in symbol_ids:
+                symbol_ids[s.name] = new_var()
+            return symbol_ids[s.name]
+
+        if isinstance(s, Not):
+            return -literal(s.operand)
+
+        v = new_var()
+        if isinstance(s, And):
+            parts = [literal(conjunct) for conjunct in s.conjuncts]
+            for p in parts:
+                clauses.append([-v, p])
+            clauses.append([v] + [-p for p in parts])
+        elif isinstance(s, Or):
+            parts = [literal(disjunct) for disjunct in s.disjuncts]
+            clauses.append([-v] + parts)
+            for p in parts:
+                clauses.append([v, -p])
+        elif isinstance(s, Implication):
+            a = literal(s.antecedent)
+            b = literal(s.consequent)
+            clauses.append([-v, -a, b])
+            clauses.append([v, a])
+            clauses.append([v, -b])
+        elif isinstance(s, Biconditional):
+            a = literal(s.left)
+            b = literal(s.right)
+            clauses.append([-v, -a, b])
+            clauses.append([-v, a, -b])
+            clauses.append([v, a, b])
+            clauses.append([v, -a, -b])
+        else:
+            raise Exception(f"cannot convert {s} to CNF")
+        return v
+
+    clauses.append([literal(sentence)])
+    return clauses, symbol_ids
+
+
+def dpll_satisfiable(clauses):
+    """
+    Checks if a CNF clause list is satisfiable with plain DPLL:
+    unit propagation, then branch on the first unassigned literal.
+    """
+
+    def simplify(clauses, lit):
+        """Assigns `lit` true, dropping and shortening clauses."""
+        result = []
+        for clause in clauses:
+            if lit in clause:
+                continue
+            if -lit in clause:
+                clause = [l for l in clause if l != -lit]
+                if not clause:
+                    return None
+            result.append(clause)
+        return result
+
+    def solve(clauses):
+        # Propagate unit clauses until fixpoint.
+        while clauses:
+            units = [clause[0] for clause in clauses if len(clause) == 1]
+            if not units:
+                break
+            clauses = simplify(clauses, units[0])
+            if clauses is None:
+                return False
+
+        # No clauses left means everything is satisfied.
+        if not clauses:
+            return True
+
+        # Branch on some remaining literal.
+        lit = clauses[0][0]
+        return (solve(clauses + [[lit]]) or
+                solve(clauses + [[-lit]]))
+
+    return solve(list(clauses))
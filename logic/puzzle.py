@@ -2,6 +2,12 @@
 
 from logic import *
 
+try:
+    from pysat.solvers import Glucose3
+except ImportError:
+    # Without pysat, entailment falls back to the DPLL in logic.py.
+    Glucose3 = None
+
 
 AKnight = Symbol("A is a Knight")
 AKnave = Symbol("A is a Knave")
@@ -78,10 +84,26 @@ def main():
         print(puzzle)
         if len(knowledge.conjuncts) == 0:
             print("    Not yet implemented.")
-        else:
-            for symbol in symbols:
-                if model_check(knowledge, symbol):
-                    print(f"    {symbol}")
+            continue
+
+        # Convert the knowledge to CNF once per puzzle; each symbol is
+        # then a single SAT call (knowledge ∧ ¬symbol unsatisfiable
+        # means the symbol is entailed) instead of a fresh model
+        # enumeration per query.
+        clauses, symbol_ids = to_cnf(knowledge)
+        solver = Glucose3(bootstrap_with=clauses) if Glucose3 else None
+        for symbol in symbols:
+            query = -symbol_ids[symbol.name]
+            if solver is not None:
+                # Query under an assumption so the solver keeps its
+                # learned clauses between symbols.
+                entailed = not solver.solve(assumptions=[query])
+            else:
+                entailed = not dpll_satisfiable(clauses + [[query]])
+            if entailed:
+                print(f"    {symbol}")
+        if solver is not None:
+            solver.delete()
 
 
 if __name__ == "__main__":
@@ -1,9 +1,11 @@
 # >_ uv run --with check50 check50 --local ai50/projects/2024/x/heredity
 
 import csv
-import itertools
+import string
 import sys
 
+import numpy as np
+
 PROBS = {
     # Unconditional probabilities for having gene
     "gene": { 2: 0.01, 1: 0.03, 0: 0.96 },
@@ -40,26 +42,24 @@ def main():
         for person in people
     }
 
-    # Loop over all sets of people who might have the trait
-    names = set(people)
-    for have_trait in powerset(names):
-
-        # Check if current set of people violates known information
-        fails_evidence = any(
-            (people[person]["trait"] is not None and
-             people[person]["trait"] != (person in have_trait))
-            for person in names
-        )
-        if fails_evidence:
-            continue
-
-        # Loop over all sets of people who might have the gene
-        for one_gene in powerset(names):
-            for two_genes in powerset(names - one_gene):
-
-                # Update probabilities with new joint probability
-                p = joint_probability(people, one_gene, two_genes, have_trait)
-                update(probabilities, one_gene, two_genes, have_trait, p)
+    # The joint distribution factorizes per person (gene prior or
+    # gene-given-parents, times trait evidence), so instead of summing
+    # the joint over every gene/trait assignment we run variable
+    # elimination on those factors: exponentially fewer multiplications.
+    order = topo_sorted(people)
+    for person in people:
+        genes_dist = gene_distribution(people, order, person)
+        probabilities[person]["gene"] = genes_dist
+
+        # Trait is independent of everyone else given the gene count,
+        # so its posterior is a mixture of the trait likelihoods.
+        for trait in (True, False):
+            probabilities[person]["trait"][trait] = sum(
+                genes_dist[genes] * PROBS["trait"][genes][trait]
+                for genes in (2, 1, 0)
+            ) if people[person]["trait"] is None else (
+                1.0 if people[person]["trait"] == trait else 0.0
+            )
 
     # Ensure probabilities sum to 1
     normalize(probabilities)
@@ -96,98 +96,127 @@ def load_data(filename):
     return data
 
 
-def powerset(s):
+def topo_sorted(people):
     """
-    Return a list of all possible subsets of set s.
+    Return the names in `people` ordered parents-before-children.
     """
-    s = list(s)
-    return [
-        set(s) for s in itertools.chain.from_iterable(
-            itertools.combinations(s, r) for r in range(len(s) + 1)
-        )
-    ]
-
-def get_genes_count(name, one_gene, two_genes):
-    return (1 if name in one_gene else
-            2 if name in two_genes else 0)
-
-def get_pass_prob(count):
+    order = []
+    seen = set()
+
+    def visit(name):
+        if name in seen:
+            return
+        seen.add(name)
+        if people[name]["mother"] is not None:
+            visit(people[name]["mother"])
+            visit(people[name]["father"])
+        order.append(name)
+
+    for name in people:
+        visit(name)
+    return order
+
+
+# Probability of a parent with 0, 1 or 2 genes passing the gene on.
+PASS_PROB = np.array([PROBS['mutation'], 0.5, 1 - PROBS['mutation']])
+
+# PROBS as arrays indexed by gene count (and False/True trait).
+GENE_PRIOR = np.array([PROBS['gene'][genes] for genes in range(3)])
+TRAIT_PROB = np.array([[PROBS['trait'][genes][bool(trait)]
+                        for trait in range(2)]
+                       for genes in range(3)])
+
+
+def trait_likelihood(person):
     """
-    Returns the probability of a parent with 'count' genes
-    pasing the gene to the child.
+    Returns the probability of `person`'s observed trait for each gene
+    count, or ones if the trait is unknown (summing it out contributes 1).
     """
-    if count == 2: return 1 - PROBS['mutation']
-    elif count == 1: return 0.5
-    else: return PROBS['mutation']
+    if person["trait"] is None:
+        return np.ones(3)
+    return TRAIT_PROB[:, int(person["trait"])]
+
 
-def joint_probability(people, one_gene, two_genes, have_trait):
+def build_factors(people):
     """
-    Compute and return a joint probability.
-
-    The probability returned should be the probability that
-        * everyone in set `one_gene` has one copy of the gene, and
-        * everyone in set `two_genes` has two copies of the gene, and
-        * everyone not in `one_gene` or `two_gene` does not have the gene, and
-        * everyone in set `have_trait` has the trait, and
-        * everyone not in set` have_trait` does not have the trait.
+    Build one factor per person: the gene prior for people without
+    parents, or the gene-given-parents table otherwise, with the trait
+    evidence folded in. A factor is a `(names, table)` pair where
+    `table` is an array with one length-3 axis (gene count) per name.
     """
-    p = 1.0
-
+    factors = []
     for person in people.values():
         name = person['name']
         mother, father = person['mother'], person['father']
 
-        genes_query = get_genes_count(name, one_gene, two_genes)
-        trait_query = name in have_trait
+        if mother is None:
+            factors.append(((name,), GENE_PRIOR * trait_likelihood(person)))
+            continue
 
-        is_parents_data_available = mother is not None
+        # Note: mother passing the gene and father passing the gene are
+        # independent events, so the child table is built from outer
+        # products of the parents' pass probabilities.
+        m_pass, f_pass = PASS_PROB, PASS_PROB
+        table = np.stack([
+            # father doesn't pass gene AND mother doesn't either
+            np.outer(1 - m_pass, 1 - f_pass),
 
-        # Compute and apply probability of genes_query to result.
-        if is_parents_data_available:
-            m_genes = get_genes_count(mother, one_gene, two_genes)
-            f_genes = get_genes_count(father, one_gene, two_genes)
+            # (mather passes gene AND father doesn't)
+            #   OR
+            # (father passes gene AND mother doesn't)
+            np.outer(m_pass, 1 - f_pass) + np.outer(1 - m_pass, f_pass),
 
-            # Note: mother passing the gene and father passing
-            # the gene are independent events.
-            m_pass_prob = get_pass_prob(m_genes)
-            f_pass_prob = get_pass_prob(f_genes)
+            # mother passes gene AND father passes gene
+            np.outer(m_pass, f_pass)
+        ])
+        table *= trait_likelihood(person)[:, None, None]
+        factors.append(((name, mother, father), table))
 
-            child_genes_probs = {
-                # mother passes gene AND father passes gene
-                2: m_pass_prob * f_pass_prob,
+    return factors
 
-                # (mather passes gene AND father doesn't)
-                #   OR
-                # (father passes gene AND mother doesn't)
-                1: (m_pass_prob * (1 - f_pass_prob)) + (f_pass_prob * (1 - m_pass_prob)),
 
-                # father doesn't pass gene AND mother doesn't either
-                0: (1 - f_pass_prob) * (1 - m_pass_prob)
-            }
+def sum_out(name, factors):
+    """
+    Eliminate `name` from `factors`: multiply every factor mentioning
+    it and marginalize the gene count away, leaving one smaller factor.
+    """
+    related = [f for f in factors if name in f[0]]
+    rest = [f for f in factors if name not in f[0]]
 
-            p *= child_genes_probs[genes_query]
-        else:
-            p *= PROBS['gene'][genes_query]
+    # Variables of the merged factor, in first-seen order.
+    names = tuple(dict.fromkeys(
+        n for f_names, _ in related for n in f_names if n != name
+    ))
 
-        # Compute and apply probability of trait_query to result
-        p *= PROBS['trait'][genes_query][trait_query]
+    # One einsum letter per variable; `name`'s axis is summed away by
+    # leaving it out of the output subscripts.
+    letter = {n: string.ascii_lowercase[i]
+              for i, n in enumerate((name,) + names)}
+    subscripts = ",".join("".join(letter[n] for n in f_names)
+                          for f_names, _ in related)
+    output = "".join(letter[n] for n in names)
+    table = np.einsum(f"{subscripts}->{output}",
+                      *(f_table for _, f_table in related))
 
-    return p
+    return rest + [(names, table)]
 
 
-def update(probabilities, one_gene, two_genes, have_trait, p):
+def gene_distribution(people, order, target):
     """
-    Add to `probabilities` a new joint probability `p`.
-    Each person should have their "gene" and "trait" distributions updated.
-    Which value for each distribution is updated depends on whether
-    the person is in `have_gene` and `have_trait`, respectively.
+    Compute `target`'s (unnormalized) posterior gene distribution by
+    eliminating everyone else, children before parents so the
+    intermediate factors stay small.
     """
-    for name in probabilities:
-        genes = get_genes_count(name, one_gene, two_genes)
-        trait = name in have_trait
-        probabilities[name]['gene'][genes] += p
-        probabilities[name]['trait'][trait] += p
-    return probabilities
+    factors = build_factors(people)
+    for name in reversed(order):
+        if name != target:
+            factors = sum_out(name, factors)
+
+    # Whatever remains mentions at most `target`.
+    dist = np.ones(3)
+    for f_names, f_table in factors:
+        dist = dist * f_table if f_names else dist * float(f_table)
+    return {genes: dist[genes] for genes in (2, 1, 0)}
 
 
 def normalize(probabilities):
@@ -0,0 +1,54 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""
+C core for pagerank.py's fixed-point iteration.
+
+Build in place (writes _pagerank_core.*.so next to this file):
+
+    python setup.py build_ext --inplace
+
+pagerank.py falls back to its numba/NumPy kernel when the extension
+has not been built.
+"""
+
+import numpy as np
+
+from libc.math cimport fabs
+
+
+def pr_iter(int[::1] indptr, int[::1] indices, double[::1] inv_numlinks,
+            double d, int N, double tol):
+    """
+    Mirror of pagerank._pr_iter: Jacobi iteration of the PageRank
+    fixed point over CSR arrays until the total (L1) movement drops
+    below `tol` per page on average.
+    """
+    PR_arr = np.full(N, 1.0 / N)
+    newPR_arr = np.empty(N)
+    cdef double[::1] PR = PR_arr
+    cdef double[::1] newPR = newPR_arr
+    cdef double delta = tol * N
+    cdef double sink_mass, base, s
+    cdef int page, k
+
+    while delta >= tol * N:
+
+        # Pages with no links spread their whole rank uniformly.
+        sink_mass = 0.0
+        for page in range(N):
+            if inv_numlinks[page] == 0.0:
+                sink_mass += PR[page]
+        base = (1 - d) / N + d * sink_mass / N
+
+        for page in range(N):
+            s = 0.0
+            for k in range(indptr[page], indptr[page + 1]):
+                s += PR[indices[k]] * inv_numlinks[indices[k]]
+            newPR[page] = base + d * s
+
+        delta = 0.0
+        for page in range(N):
+            delta += fabs(newPR[page] - PR[page])
+        PR, newPR = newPR, PR
+        PR_arr, newPR_arr = newPR_arr, PR_arr
+
+    return PR_arr
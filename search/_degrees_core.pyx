@@ -0,0 +1,116 @@
+# cython: boundscheck=False, wraparound=False
+"""
+C core for degrees.py's bidirectional BFS.
+
+Build in place (writes _degrees_core.*.so next to this file):
+
+    python setup.py build_ext --inplace
+
+degrees.py falls back to its pure Python search when the extension
+has not been built.
+"""
+
+import numpy as np
+
+
+def bfs_bidirectional(int[::1] p_indptr, int[::1] p_movies,
+                      int[::1] m_indptr, int[::1] m_stars,
+                      int source, int target):
+    """
+    Mirror of degrees.shortest_path over the CSR graph: returns the
+    shortest list of (movie index, person index) pairs connecting
+    source to target, or None.
+    """
+    if source == target:
+        return []
+
+    cdef int n = p_indptr.shape[0] - 1
+
+    # Per side: movie/parent of the edge back toward that side's
+    # endpoint and depth of each actor (-1 = unreached).
+    fwd_arrs = [np.full(n, -1, dtype=np.int32) for _ in range(3)]
+    bwd_arrs = [np.full(n, -1, dtype=np.int32) for _ in range(3)]
+    cdef int[::1] fwd_movie = fwd_arrs[0]
+    cdef int[::1] fwd_parent = fwd_arrs[1]
+    cdef int[::1] fwd_dist = fwd_arrs[2]
+    cdef int[::1] bwd_movie = bwd_arrs[0]
+    cdef int[::1] bwd_parent = bwd_arrs[1]
+    cdef int[::1] bwd_dist = bwd_arrs[2]
+    fwd_dist[source] = 0
+    bwd_dist[target] = 0
+    fwd_frontier, bwd_frontier = [source], [target]
+
+    cdef int[::1] movie, parent, dist, other_dist
+    cdef int curr_id, depth, k, t, movie_id, star_id, meet
+    cdef bint forward
+
+    while fwd_frontier and bwd_frontier:
+        # Expand the smaller frontier one full level.
+        forward = len(fwd_frontier) <= len(bwd_frontier)
+        if forward:
+            movie, parent, dist = fwd_movie, fwd_parent, fwd_dist
+            frontier, other_dist = fwd_frontier, bwd_dist
+        else:
+            movie, parent, dist = bwd_movie, bwd_parent, bwd_dist
+            frontier, other_dist = bwd_frontier, fwd_dist
+
+        next_frontier = []
+        meet = -1
+        for curr_id in frontier:
+            depth = dist[curr_id] + 1
+            for k in range(p_indptr[curr_id], p_indptr[curr_id + 1]):
+                movie_id = p_movies[k]
+                for t in range(m_indptr[movie_id], m_indptr[movie_id + 1]):
+                    star_id = m_stars[t]
+
+                    # No need to push self-loops or people this side
+                    # has already reached.
+                    if star_id == curr_id or dist[star_id] != -1:
+                        continue
+                    movie[star_id] = movie_id
+                    parent[star_id] = curr_id
+                    dist[star_id] = depth
+                    next_frontier.append(star_id)
+
+                    # The searches touching means a full path exists;
+                    # finish the level and keep the meeting point
+                    # closest to the other endpoint.
+                    if other_dist[star_id] != -1 and (
+                            meet == -1 or
+                            other_dist[star_id] < other_dist[meet]):
+                        meet = star_id
+
+        if meet != -1:
+            return _stitch(meet, fwd_movie, fwd_parent,
+                           bwd_movie, bwd_parent)
+        if forward:
+            fwd_frontier = next_frontier
+        else:
+            bwd_frontier = next_frontier
+
+    return None
+
+
+cdef _stitch(int meet, int[::1] fwd_movie, int[::1] fwd_parent,
+             int[::1] bwd_movie, int[::1] bwd_parent):
+    """
+    Join the two half-paths through `meet` into a single list of
+    (movie index, person index) pairs from source to target.
+    """
+    path = []
+    cdef int curr_id = meet
+
+    # Forward half: walk meet back to the source, then flip it around.
+    while fwd_parent[curr_id] != -1:
+        path.append((fwd_movie[curr_id], curr_id))
+        curr_id = fwd_parent[curr_id]
+    path.reverse()
+
+    # Backward half: walk meet toward the target. Starring together is
+    # symmetric, so each edge flips into (movie, next person) as is.
+    curr_id = meet
+    while bwd_parent[curr_id] != -1:
+        path.append((bwd_movie[curr_id], bwd_parent[curr_id]))
+        curr_id = bwd_parent[curr_id]
+
+    return path
@@ -3,56 +3,99 @@
 
 import csv
 import sys
-from collections import deque
 
-# Maps names to a set of corresponding person_ids
+import numpy as np
+
+try:
+    # Compiled BFS core; see setup.py at the repo root.
+    import _degrees_core
+except ImportError:
+    _degrees_core = None
+
+# People and movies live in parallel arrays indexed by dense ints, with
+# the star/movie adjacency flattened into CSR arrays: the BFS then
+# streams contiguous int32 indices instead of chasing dict-of-dict-of-
+# set pointers and hashing id strings per edge.
+
+# Maps lowercase names to a set of corresponding person indices
 names = {}
 
-# Maps person_ids to a dictionary of: name, birth, movies (a set of movie_ids)
-people = {}
+# Person attributes, indexed by person index
+person_id = []
+person_name = []
+person_birth = []
 
-# Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
-movies = {}
+# Movie attributes, indexed by movie index
+movie_id = []
+movie_title = []
+movie_year = []
+
+# CSR adjacency: person i stars in p_movies[p_indptr[i]:p_indptr[i+1]],
+# movie j stars m_stars[m_indptr[j]:m_indptr[j+1]]
+p_indptr = p_movies = None
+m_indptr = m_stars = None
 
 
 def load_data(directory):
     """
     Load data from CSV files into memory.
     """
-    # Load people
+    global p_indptr, p_movies, m_indptr, m_stars
+
+    # Load people, assigning each a dense index
+    person_index = {}
     with open(f"{directory}/people.csv", encoding="utf-8") as f:
         reader = csv.DictReader(f)
         for row in reader:
-            people[row["id"]] = {
-                "name": row["name"],
-                "birth": row["birth"],
-                "movies": set()
-            }
+            person_index[row["id"]] = len(person_id)
+            person_id.append(row["id"])
+            person_name.append(row["name"])
+            person_birth.append(row["birth"])
             if row["name"].lower() not in names:
-                names[row["name"].lower()] = {row["id"]}
+                names[row["name"].lower()] = {person_index[row["id"]]}
             else:
-                names[row["name"].lower()].add(row["id"])
+                names[row["name"].lower()].add(person_index[row["id"]])
 
     # Load movies
+    movie_index = {}
     with open(f"{directory}/movies.csv", encoding="utf-8") as f:
         reader = csv.DictReader(f)
         for row in reader:
-            movies[row["id"]] = {
-                "title": row["title"],
-                "year": row["year"],
-                "stars": set()
-            }
+            movie_index[row["id"]] = len(movie_id)
+            movie_id.append(row["id"])
+            movie_title.append(row["title"])
+            movie_year.append(row["year"])
 
-    # Load stars
+    # Load stars as (person, movie) edges
+    edges = set()
     with open(f"{directory}/stars.csv", encoding="utf-8") as f:
         reader = csv.DictReader(f)
         for row in reader:
             try:
-                people[row["person_id"]]["movies"].add(row["movie_id"])
-                movies[row["movie_id"]]["stars"].add(row["person_id"])
+                edges.add((person_index[row["person_id"]],
+                           movie_index[row["movie_id"]]))
             except KeyError:
                 pass
 
+    # Scatter the edges into one CSR per direction
+    persons = np.fromiter((p for p, _ in edges), dtype=np.int32,
+                          count=len(edges))
+    stars_in = np.fromiter((m for _, m in edges), dtype=np.int32,
+                           count=len(edges))
+    p_indptr, p_movies = _build_csr(persons, stars_in, len(person_id))
+    m_indptr, m_stars = _build_csr(stars_in, persons, len(movie_id))
+
+
+def _build_csr(src, dst, n):
+    """
+    Group the edges (src[k], dst[k]) by source: returns (indptr, out)
+    with src i's targets in out[indptr[i]:indptr[i+1]].
+    """
+    indptr = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    out = dst[np.argsort(src, kind="stable")]
+    return indptr, out
+
 
 def main():
     if len(sys.argv) > 2:
@@ -80,67 +123,113 @@ def main():
         print(f"{degrees} degrees of separation.")
         path = [(None, source)] + path
         for i in range(degrees):
-            person1 = people[path[i][1]]["name"]
-            person2 = people[path[i + 1][1]]["name"]
-            movie = movies[path[i + 1][0]]["title"]
+            person1 = person_name[path[i][1]]
+            person2 = person_name[path[i + 1][1]]
+            movie = movie_title[path[i + 1][0]]
             print(f"{i + 1}: {person1} and {person2} starred in {movie}")
 
 
 def shortest_path(source, target):
     """
-    Returns the shortest list of (movie_id, person_id) pairs
+    Returns the shortest list of (movie index, person index) pairs
     that connect the source to the target.
 
     If no possible path, returns None.
+
+    Runs a bidirectional BFS: one search from each end, always
+    expanding the smaller frontier, meeting in the middle. Each side
+    explores O(b^(d/2)) people instead of the O(b^d) of a single-ended
+    search.
     """
 
+    if _degrees_core is not None:
+        return _degrees_core.bfs_bidirectional(p_indptr, p_movies,
+                                               m_indptr, m_stars,
+                                               source, target)
+
     # Actors' distance to themselves is 0.
     if source == target:
         return []
 
-    # Doubly linked list for efficient FIFO push/pop operations.
-    fifo = deque([(source, None, None)])
-    # Set for efficient frontier membership lookup.
-    fifo_set = set({source})
-
-    # Map from actor id to (movie_id, parent_id).
-    visited = {}
-
-    while len(fifo) > 0:
-        # Pop new connection to explore from deque.
-        curr_id, connection_movie_id, parent_id = fifo.popleft()
-
-        # Save the movie and connection that led us here.
-        visited[curr_id] = (connection_movie_id, parent_id)
+    # Per side: parent pointers and the movie of the edge back toward
+    # that side's endpoint, depth of each actor (-1 = unreached), and
+    # the current frontier. Flat int32 arrays, so reached-checks are
+    # plain loads instead of hash lookups.
+    n = len(person_id)
+    fwd = (np.full(n, -1, dtype=np.int32), np.full(n, -1, dtype=np.int32),
+           np.full(n, -1, dtype=np.int32))
+    bwd = (np.full(n, -1, dtype=np.int32), np.full(n, -1, dtype=np.int32),
+           np.full(n, -1, dtype=np.int32))
+    fwd[2][source] = 0
+    bwd[2][target] = 0
+    fwd_frontier, bwd_frontier = [source], [target]
+
+    while fwd_frontier and bwd_frontier:
+        # Expand the smaller frontier one full level.
+        forward = len(fwd_frontier) <= len(bwd_frontier)
+        (movie, parent, dist), frontier = ((fwd, fwd_frontier) if forward
+                                           else (bwd, bwd_frontier))
+        other_dist = bwd[2] if forward else fwd[2]
+
+        next_frontier = []
+        meet = -1
+        for curr_id in frontier:
+            depth = dist[curr_id] + 1
+            for movie_id, star_id in neighbors_for_person(curr_id):
+
+                # No need to push self-loops or people this side
+                # has already reached.
+                if star_id == curr_id or dist[star_id] != -1:
+                    continue
+                movie[star_id] = movie_id
+                parent[star_id] = curr_id
+                dist[star_id] = depth
+                next_frontier.append(star_id)
+
+                # The searches touching means a full path exists;
+                # finish the level and keep the meeting point closest
+                # to the other endpoint.
+                if other_dist[star_id] != -1 and (
+                        meet == -1 or
+                        other_dist[star_id] < other_dist[meet]):
+                    meet = star_id
+
+        if meet != -1:
+            return _stitch(meet, fwd, bwd)
+        if forward:
+            fwd_frontier = next_frontier
+        else:
+            bwd_frontier = next_frontier
 
-        # Push this person's neighbors to the deque for later exploration.
-        for movie_id, star_id in neighbors_for_person(curr_id):
+    return None
 
-            # No need to push neighbors already explored in the past
-            # or already present in the deque.
-            if star_id in visited or star_id in fifo_set:
-                continue
 
-            # If one of the neighbors is the target, we can reconstruct
-            # the path from source to this and call it a day.
-            if star_id == target:
-                path = [(movie_id, star_id)]
-                while curr_id != source:
-                    prev_movie_id, parent_id = visited[curr_id]
-                    path.append((prev_movie_id, curr_id))
-                    curr_id = parent_id
-                return list(reversed(path))
+def _stitch(meet, fwd, bwd):
+    """
+    Join the two half-paths through `meet` into a single list of
+    (movie index, person index) pairs from source to target.
+    """
+    # Forward half: walk meet back to the source, then flip it around.
+    path = []
+    curr_id = meet
+    while fwd[1][curr_id] != -1:
+        path.append((int(fwd[0][curr_id]), int(curr_id)))
+        curr_id = fwd[1][curr_id]
+    path.reverse()
 
-            # Else, we add them to the deque for later exploration.
-            fifo.append((star_id, movie_id, curr_id))
-            fifo_set.add(star_id)
+    # Backward half: walk meet toward the target. Starring together is
+    # symmetric, so each edge flips into (movie, next person) as is.
+    curr_id = meet
+    while bwd[1][curr_id] != -1:
+        path.append((int(bwd[0][curr_id]), int(bwd[1][curr_id])))
+        curr_id = bwd[1][curr_id]
 
-    return None
+    return path
 
 
 def person_id_for_name(name):
     """
-    Returns the IMDB id for a person's name,
+    Returns the person index for a person's name,
     resolving ambiguities as needed.
     """
     person_ids = list(names.get(name.lower(), set()))
@@ -148,15 +237,14 @@ def person_id_for_name(name):
         return None
     elif len(person_ids) > 1:
         print(f"Which '{name}'?")
-        for person_id in person_ids:
-            person = people[person_id]
-            name = person["name"]
-            birth = person["birth"]
-            print(f"ID: {person_id}, Name: {name}, Birth: {birth}")
+        for person in person_ids:
+            print(f"ID: {person_id[person]}, Name: {person_name[person]}, "
+                  f"Birth: {person_birth[person]}")
         try:
-            person_id = input("Intended Person ID: ")
-            if person_id in person_ids:
-                return person_id
+            chosen = input("Intended Person ID: ")
+            for person in person_ids:
+                if person_id[person] == chosen:
+                    return person
         except ValueError:
             pass
         return None
@@ -164,17 +252,15 @@ def person_id_for_name(name):
         return person_ids[0]
 
 
-def neighbors_for_person(person_id):
+def neighbors_for_person(person):
     """
-    Returns (movie_id, person_id) pairs for people
+    Returns (movie index, person index) pairs for people
     who starred with a given person.
     """
-    movie_ids = people[person_id]["movies"]
-    neighbors = set()
-    for movie_id in movie_ids:
-        for star_id in movies[movie_id]["stars"]:
-            neighbors.add((movie_id, star_id))
-    return neighbors
+    for k in range(p_indptr[person], p_indptr[person + 1]):
+        movie = p_movies[k]
+        for t in range(m_indptr[movie], m_indptr[movie + 1]):
+            yield movie, m_stars[t]
 
 
 if __name__ == "__main__":
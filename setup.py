@@ -0,0 +1,26 @@
+"""
+Builds the optional Cython cores for pagerank and degrees:
+
+    python setup.py build_ext --inplace
+
+The scripts run fine without them; they just fall back to their
+numba/pure Python kernels.
+"""
+
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+setup(
+    name="gofai-core",
+    ext_modules=cythonize(
+        [
+            # Dotted names so build_ext --inplace drops each .so next
+            # to the script that imports it.
+            Extension("probability.pagerank._pagerank_core",
+                      ["probability/pagerank/_pagerank_core.pyx"]),
+            Extension("search._degrees_core",
+                      ["search/_degrees_core.pyx"]),
+        ],
+        language_level=3,
+    ),
+)